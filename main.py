@@ -1,27 +1,39 @@
 import os
-import uuid
+import asyncio
+import itertools
 import logging
 from io import BytesIO
 
 from fastapi import FastAPI, File, UploadFile
-from fastapi.responses import StreamingResponse, JSONResponse
+from fastapi.responses import Response, JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 from pptx import Presentation
 from pptx.enum.shapes import MSO_SHAPE_TYPE
 
+import docx
 from docx import Document
+from docx.shape import InlineShape
 from docx.shared import Pt, RGBColor as DocxRGB, Inches
-from docx.oxml import parse_xml
-from docx.oxml.ns import nsdecls
-from pptx.oxml.ns import qn
+from docx.oxml import parse_xml, OxmlElement
+from docx.oxml.ns import nsdecls, qn as w_qn
+from lxml import etree
 
 
-import matplotlib.pyplot as plt
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont
+import copy
+import hashlib
+import threading
+from xml.sax.saxutils import escape as xml_escape
+import posixpath
 import tempfile
+import zipfile
 import unicodedata, re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 
 
 # -------------------------
@@ -43,10 +55,31 @@ app.add_middleware(
     allow_credentials=True,
 )
 
+# Compresses JSON/HTML responses; the docx response opts out via an
+# explicit Content-Encoding (gzip-in-zip just wastes CPU).
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+@app.on_event("startup")
+def _warm_matplotlib():
+    """Render a throwaway plot so the first chart-bearing request doesn't
+    pay the matplotlib import, Agg renderer init and font-cache scan
+    (often 0.5-1.5 s together)."""
+    fig = _get_chart_fig()
+    fig.clear()
+    ax = fig.add_subplot(111)
+    ax.plot([0, 1])
+    fig.canvas.draw()
+    fig.clear()
+
 # -------------------------
 # Helpers
 # -------------------------
 
+# Deletion table for C0 controls except \t, \n, \r; str.translate runs the
+# scan in C instead of a per-character Python loop.
+_CTRL_TABLE = {code: None for code in range(32) if code not in (9, 10, 13)}
+
+
 def sanitize_text(s: str) -> str:
     """
     Remove control characters that break python-docx (e.g. NUL, other C0 controls).
@@ -54,30 +87,42 @@ def sanitize_text(s: str) -> str:
     """
     if s is None:
         return ""
-    # Replace NULL bytes and other C0 controls except \n, \r, \t
-    clean_chars = []
-    removed = 0
-    for ch in s:
-        code = ord(ch)
-        if code == 0:
-            removed += 1
-            continue
-        # allow printable + common whitespace
-        if code >= 32 or ch in ("\n", "\r", "\t"):
-            clean_chars.append(ch)
-        else:
-            removed += 1
-    clean = "".join(clean_chars)
+    clean = s.translate(_CTRL_TABLE)
+    removed = len(s) - len(clean)
     if removed:
         logger.debug(f"sanitize_text: removed {removed} control chars")
     return clean
 
 
+_SAFE_NAME_RE = re.compile(r"[^\w\-_. ]")
+
+
 def safe_filename(name: str) -> str:
     name = unicodedata.normalize("NFKD", name)
-    name = re.sub(r"[^\w\-_. ]", "_", name)
+    name = _SAFE_NAME_RE.sub("_", name)
     return name.strip() or "converted"
 
+UPLOAD_CHUNK = 1 << 20  # 1 MiB
+UPLOAD_SPOOL_MAX = 16 << 20  # spill uploads beyond this to disk
+
+# Compiled once: lxml re-parses XPath strings on every .xpath() call.
+_XP_NS = {
+    "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
+    "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+}
+_BLIP_EMBED_XP = etree.XPath(".//a:blip/@r:embed", namespaces=_XP_NS)
+_BLIP_XP = etree.XPath(".//a:blip", namespaces=_XP_NS)
+
+# True when a paragraph holds at least one non-whitespace text node;
+# cheaper than para.text, which joins every run only to be discarded.
+_NONEMPTY_T_XP = etree.XPath("boolean(.//a:t[normalize-space()])", namespaces=_XP_NS)
+
+# Document() opens and ZIP-parses python-docx's bundled default.docx from
+# disk on every call; read it once and hand each request its own BytesIO.
+with open(os.path.join(os.path.dirname(docx.__file__),
+                       "templates", "default.docx"), "rb") as _f:
+    _DOCX_TEMPLATE = _f.read()
+
 EMU_PER_INCH = 914400
 def emu_to_inches(emu): return emu / EMU_PER_INCH
 
@@ -85,7 +130,10 @@ def render_shape_to_image(shape):
     """Draw PPT shape (rect/ellipse/triangle) as an image with text."""
     width_in = emu_to_inches(shape.width)
     height_in = emu_to_inches(shape.height)
-    img_w, img_h = int(width_in * 300), int(height_in * 300)
+    # 150 DPI matches what Word actually displays; clamp so a slide-sized
+    # shape cannot allocate a multi-hundred-MB pixel buffer.
+    img_w = min(max(int(width_in * 150), 1), 2000)
+    img_h = min(max(int(height_in * 150), 1), 2000)
     img = Image.new("RGB", (img_w, img_h), "white")
     draw = ImageDraw.Draw(img)
 
@@ -101,18 +149,30 @@ def render_shape_to_image(shape):
     # draw border + fill
     draw.rectangle([0, 0, img_w - 2, img_h - 2], fill=fill_color, outline="black", width=5)
 
-    # add shape text
+    # add shape text (shape.text walks every run; read it once)
     try:
-        if shape.has_text_frame and shape.text.strip():
-            text = shape.text.strip()
+        text = shape.text.strip() if shape.has_text_frame else ""
+        if text:
             font = ImageFont.load_default()
             draw.text((20, img_h / 2.5), text, fill="black", font=font)
     except Exception as e:
         logger.debug(f"Shape text draw failed: {e}")
 
-    tmp_img = tempfile.NamedTemporaryFile(delete=False, suffix=".png")
-    img.save(tmp_img.name)
-    return tmp_img.name, width_in, height_in
+    buf = BytesIO()
+    img.save(buf, format="PNG")
+    buf.seek(0)
+    return buf, width_in, height_in
+
+# Parsed once; deepcopied per section instead of re-running the lxml
+# parser on the same string.
+_PG_BORDERS = parse_xml(r'''
+<w:pgBorders %s>
+    <w:top w:val="double" w:sz="6" w:space="24" w:color="000000"/>
+    <w:left w:val="double" w:sz="6" w:space="24" w:color="000000"/>
+    <w:bottom w:val="double" w:sz="6" w:space="24" w:color="000000"/>
+    <w:right w:val="double" w:sz="6" w:space="24" w:color="000000"/>
+</w:pgBorders>
+''' % nsdecls('w'))
 
 def add_page_border(doc):
     """Add a double-line border around each page."""
@@ -121,43 +181,211 @@ def add_page_border(doc):
         section.bottom_margin = Inches(0.8)
         section.left_margin = Inches(0.8)
         section.right_margin = Inches(0.8)
-        pgBorders = parse_xml(r'''
-        <w:pgBorders %s>
-            <w:top w:val="double" w:sz="6" w:space="24" w:color="000000"/>
-            <w:left w:val="double" w:sz="6" w:space="24" w:color="000000"/>
-            <w:bottom w:val="double" w:sz="6" w:space="24" w:color="000000"/>
-            <w:right w:val="double" w:sz="6" w:space="24" w:color="000000"/>
-        </w:pgBorders>
-        ''' % nsdecls('w'))
-        section._sectPr.append(pgBorders)
+        section._sectPr.append(copy.deepcopy(_PG_BORDERS))
 
 def pptx_color_to_rgb(color_obj):
+    if color_obj is None:
+        return None
     try:
-        if color_obj and color_obj.type == 1:  # RGB
-            rgb = color_obj.rgb
-            return DocxRGB(rgb[0], rgb[1], rgb[2])
-    except Exception as e:
-        logger.debug(f"pptx_color_to_rgb: {e}")
-    return None
+        color_type = color_obj.type
+    except Exception:
+        return None
+    if color_type != 1:  # not RGB (e.g. theme color)
+        return None
+    try:
+        rgb = color_obj.rgb
+    except Exception:
+        return None
+    return DocxRGB(rgb[0], rgb[1], rgb[2])
+
+# Cache of <w:rPr> templates keyed by formatting; identical consecutive runs
+# reuse a deepcopy instead of rebuilding the property tree element by element.
+_RPR_CACHE = {}
+
+def fast_add_run(p_element, text, font_name, size_pt, bold, italic, underline, rgb):
+    """Append a <w:r> to a paragraph element directly with oxml.
+
+    Bypasses python-docx's per-attribute property setters, which re-parse
+    styles and create oxml elements on every assignment.
+    """
+    key = (font_name, size_pt, bold, italic, underline, rgb)
+    rPr = _RPR_CACHE.get(key)
+    if rPr is None:
+        rPr = OxmlElement("w:rPr")
+        rFonts = OxmlElement("w:rFonts")
+        rFonts.set(w_qn("w:ascii"), font_name)
+        rFonts.set(w_qn("w:hAnsi"), font_name)
+        rPr.append(rFonts)
+        if bold:
+            rPr.append(OxmlElement("w:b"))
+        if italic:
+            rPr.append(OxmlElement("w:i"))
+        if underline:
+            u = OxmlElement("w:u")
+            u.set(w_qn("w:val"), "single")
+            rPr.append(u)
+        if rgb is not None:
+            color = OxmlElement("w:color")
+            color.set(w_qn("w:val"), str(rgb))
+            rPr.append(color)
+        sz = OxmlElement("w:sz")
+        sz.set(w_qn("w:val"), str(int(size_pt * 2)))  # half-points
+        rPr.append(sz)
+        _RPR_CACHE[key] = rPr
+    r = OxmlElement("w:r")
+    r.append(copy.deepcopy(rPr))
+    t = OxmlElement("w:t")
+    t.set(w_qn("xml:space"), "preserve")
+    t.text = text
+    r.append(t)
+    p_element.append(r)
+
+def _detect_default_font(prs, fallback="Utsaah"):
+    """Return the first explicit run font found in the deck, or the fallback.
+
+    The generator short-circuits at the first named font, so a deck whose
+    opening run carries one costs O(1) instead of a full traversal.
+    """
+    try:
+        return next(
+            (run.font.name
+             for slide in prs.slides
+             for shape in slide.shapes if shape.has_text_frame
+             for para in shape.text_frame.paragraphs
+             for run in para.runs if run.font.name),
+            fallback)
+    except Exception:
+        return fallback
 
 def safe_get_text(shape):
     """Return text from a shape if available in a safe way."""
+    if not getattr(shape, "has_text_frame", False):
+        return ""
     try:
-        if hasattr(shape, "text"):
-            return shape.text or ""
+        return shape.text_frame.text or ""
     except Exception as e:
         logger.debug(f"safe_get_text: {e}")
     return ""
 
+# pid + counter is collision-free within a worker and avoids the
+# /dev/urandom read uuid4() makes per name.
+_TMP_COUNTER = itertools.count()
+
+def _tmp_path(ext: str) -> str:
+    return f"/tmp/{os.getpid()}_{next(_TMP_COUNTER)}.{ext}"
+
 def save_stream_to_file(stream_bytes: bytes, ext: str = "png"):
     """Save bytes to a temporary file and return path."""
-    path = f"/tmp/{uuid.uuid4()}.{ext}"
+    path = _tmp_path(ext)
     with open(path, "wb") as f:
         f.write(stream_bytes)
     return path
 
+# matplotlib is only needed for the chart fallback, but importing it at
+# module top costs ~400 ms on every worker start. Import on first use and
+# keep one persistent figure: creating a new Figure per chart rebuilds
+# the Agg backend state each time (~50 ms before any data is drawn).
+# Slides render in _SLIDE_POOL threads and matplotlib state is not
+# thread-safe, so figure use is serialized by _CHART_LOCK.
+_CHART_FIG = None
+_CHART_LOCK = threading.Lock()
+
+def _get_chart_fig():
+    """Import matplotlib (Agg, fixed font) and build the shared figure once."""
+    global _CHART_FIG
+    if _CHART_FIG is None:
+        with _CHART_LOCK:
+            if _CHART_FIG is None:
+                import matplotlib
+                matplotlib.use("Agg")
+                matplotlib.rcParams["font.family"] = "DejaVu Sans"
+                import matplotlib.pyplot as plt
+                _CHART_FIG = plt.figure(figsize=(6, 4))
+    return _CHART_FIG
+
+# Matplotlib's default color cycle, for the Pillow renderer.
+_CHART_COLORS = [(31, 119, 180), (255, 127, 14), (44, 160, 44), (214, 39, 40),
+                 (148, 103, 189), (140, 86, 75), (227, 119, 194), (127, 127, 127)]
+
+def _render_chart_pillow(chart_type, categories, series_list):
+    """Draw a simple bar/line chart straight with Pillow.
+
+    Covers the common cases at a fraction of matplotlib's per-figure
+    cost; raises for anything it cannot draw (pie, empty series) so the
+    caller can fall back to matplotlib.
+    """
+    ct = chart_type.lower()
+    if "pie" in ct:
+        raise RuntimeError("pie charts are left to matplotlib")
+    n_points = max(len(values) for _, values in series_list)
+    if n_points == 0:
+        raise RuntimeError("no data points")
+
+    width, height = 900, 600
+    ml, mr, mt, mb = 70, 30, 30, 70
+    plot_w, plot_h = width - ml - mr, height - mt - mb
+    img = Image.new("RGB", (width, height), "white")
+    draw = ImageDraw.Draw(img)
+    font = ImageFont.load_default()
+
+    finite = [float(v) for _, values in series_list for v in values if v == v]
+    if not finite:
+        raise RuntimeError("no finite values")
+    vmin = min(0.0, min(finite))
+    vmax = max(finite)
+    if vmax == vmin:
+        vmax = vmin + 1.0
+
+    def y_px(v):
+        return mt + (vmax - v) / (vmax - vmin) * plot_h
+
+    # axes
+    draw.line([(ml, mt), (ml, mt + plot_h)], fill="black", width=2)
+    draw.line([(ml, y_px(0.0)), (ml + plot_w, y_px(0.0))], fill="black", width=2)
+
+    n_series = len(series_list)
+    slot_w = plot_w / n_points
+    as_bars = "bar" in ct or "column" in ct or ("line" not in ct and categories is not None)
+
+    for idx, (label, values) in enumerate(series_list):
+        color = _CHART_COLORS[idx % len(_CHART_COLORS)]
+        if as_bars:
+            bar_w = (slot_w * 0.8) / n_series
+            for i, v in enumerate(values):
+                if v != v:
+                    continue
+                x0 = ml + i * slot_w + slot_w * 0.1 + idx * bar_w
+                draw.rectangle([x0, min(y_px(v), y_px(0.0)),
+                                x0 + bar_w, max(y_px(v), y_px(0.0))], fill=color)
+        else:
+            pts = [(ml + (i + 0.5) * slot_w, y_px(float(v)))
+                   for i, v in enumerate(values) if v == v]
+            if len(pts) > 1:
+                draw.line(pts, fill=color, width=3)
+            for px, py in pts:
+                draw.ellipse([px - 4, py - 4, px + 4, py + 4], fill=color)
+
+    # category labels + legend
+    if categories:
+        for i, cat in enumerate(categories[:n_points]):
+            draw.text((ml + (i + 0.5) * slot_w - 4 * len(str(cat)[:12]),
+                       mt + plot_h + 8), str(cat)[:12], fill="black", font=font)
+    lx, ly = ml + plot_w - 180, mt + 8
+    for idx, (label, _) in enumerate(series_list):
+        if not label:
+            continue
+        color = _CHART_COLORS[idx % len(_CHART_COLORS)]
+        draw.rectangle([lx, ly, lx + 12, ly + 12], fill=color)
+        draw.text((lx + 18, ly), str(label)[:24], fill="black", font=font)
+        ly += 18
+
+    buf = BytesIO()
+    img.save(buf, format="PNG", optimize=False)
+    buf.seek(0)
+    return buf
+
 def render_chart_from_chart_data(chart):
-    """Render chart via matplotlib using chart_data."""
+    """Render chart to a PNG BytesIO: Pillow fast path, matplotlib fallback."""
     try:
         chart_data = chart.chart_data
     except Exception as e:
@@ -170,12 +398,13 @@ def render_chart_from_chart_data(chart):
     except Exception:
         categories = None
 
-    # series
+    # series (ndarray values fast-path inside matplotlib)
     series_list = []
     try:
         for s in chart_data.series:
             label = s.name if hasattr(s, "name") else None
-            values = list(s.values)
+            values = np.fromiter((v if v is not None else np.nan for v in s.values),
+                                 dtype=np.float64)
             series_list.append((label, values))
     except Exception:
         raise RuntimeError("Failed to read series from chart_data")
@@ -183,69 +412,119 @@ def render_chart_from_chart_data(chart):
     if not series_list:
         raise RuntimeError("No series data found in chart_data")
 
-    # Figure
-    fig, ax = plt.subplots(figsize=(6, 4))
     try:
-        if len(series_list) == 1:
-            label, values = series_list[0]
-            if "pie" in str(chart.chart_type).lower():
-                ax.pie(values, labels=categories if categories else None, autopct="%1.1f%%")
-            elif "bar" in str(chart.chart_type).lower() or categories is not None:
-                ax.bar(categories if categories else list(range(len(values))), values, label=label)
-                if label:
+        return _render_chart_pillow(str(chart.chart_type), categories, series_list)
+    except Exception as e:
+        logger.debug(f"Pillow chart renderer fell back to matplotlib: {e}")
+
+    # Figure (reused across charts, serialized by _CHART_LOCK)
+    fig = _get_chart_fig()
+    with _CHART_LOCK:
+        fig.clear()
+        ax = fig.add_subplot(111)
+        try:
+            if len(series_list) == 1:
+                label, values = series_list[0]
+                if "pie" in str(chart.chart_type).lower():
+                    ax.pie(values, labels=categories if categories else None, autopct="%1.1f%%")
+                elif "bar" in str(chart.chart_type).lower() or categories is not None:
+                    ax.bar(categories if categories else np.arange(len(values)), values, label=label)
+                    if label:
+                        ax.legend()
+                    ax.set_xticklabels(categories if categories else [str(i) for i in range(len(values))], rotation=45, ha="right")
+                else:
+                    ax.plot(categories if categories else np.arange(len(values)), values, marker="o", label=label)
                     ax.legend()
-                ax.set_xticklabels(categories if categories else [str(i) for i in range(len(values))], rotation=45, ha="right")
             else:
-                ax.plot(categories if categories else list(range(len(values))), values, marker="o", label=label)
+                x = np.arange(len(series_list[0][1]))
+                n_series = len(series_list)
+                width = 0.8 / max(1, n_series)
+                for idx, (label, values) in enumerate(series_list):
+                    pos = x + (idx - n_series / 2) * width + width / 2
+                    ax.bar(pos, values, width=width, label=(label or f"Series {idx+1}"))
+                ax.set_xticks(x)
+                if categories:
+                    ax.set_xticklabels(categories, rotation=45, ha="right")
                 ax.legend()
-        else:
-            x = range(len(series_list[0][1]))
-            width = 0.8 / max(1, len(series_list))
-            for idx, (label, values) in enumerate(series_list):
-                pos = [xi + (idx - len(series_list)/2) * width + width/2 for xi in x]
-                ax.bar(pos, values, width=width, label=(label or f"Series {idx+1}"))
-            ax.set_xticks(x)
-            if categories:
-                ax.set_xticklabels(categories, rotation=45, ha="right")
-            ax.legend()
-    except Exception as e:
-        plt.close(fig)
-        raise RuntimeError(f"Failed to render chart via matplotlib: {e}")
+        except Exception as e:
+            fig.clear()
+            raise RuntimeError(f"Failed to render chart via matplotlib: {e}")
 
-    plt.tight_layout()
-    buf = BytesIO()
-    fig.savefig(buf, format="png", dpi=150)
-    plt.close(fig)
+        fig.tight_layout()
+        buf = BytesIO()
+        fig.savefig(buf, format="png", dpi=100)
     buf.seek(0)
-    return buf.read()
+    return buf
 
-def extract_image_from_shape(shape):
-    """Try to extract image from shape."""
+def load_media_map(pptx_buf):
+    """Read every ppt/media/* part straight out of the PPTX ZIP.
+
+    A PPTX is just a ZIP of XML + media; reading the blobs once here is
+    cheaper than resolving each picture through python-pptx's part loader.
+    """
     try:
-        if hasattr(shape, "image") and shape.image is not None:
-            return shape.image.blob
-    except:
-        pass
+        with zipfile.ZipFile(pptx_buf) as zf:
+            return {n: zf.read(n) for n in zf.namelist() if n.startswith("ppt/media/")}
+    except Exception as e:
+        logger.debug(f"Media preload failed: {e}")
+        return {}
+
+def extract_image_from_shape(shape, media=None):
+    """Try to extract image from shape."""
+    rIds = _BLIP_EMBED_XP(shape.element)
+
+    # Fast path: resolve the blip rId to its ppt/media/* entry preloaded
+    # from the ZIP, skipping the related-part blob copy.
+    if media and rIds:
+        try:
+            target = shape.part.rels[rIds[0]].target_ref
+        except KeyError:
+            target = None
+        if target:
+            name = posixpath.normpath(posixpath.join(
+                posixpath.dirname(str(shape.part.partname)), target)).lstrip("/")
+            blob = media.get(name)
+            if blob is not None:
+                return blob
+
     try:
-        blip = shape.element.xpath(".//a:blip")
-        if blip:
-            rId = blip[0].get("{http://schemas.openxmlformats.org/officeDocument/2006/relationships}embed")
-            rel = shape.part.related_parts.get(rId)
-            if rel:
-                return rel.blob
-    except:
-        pass
+        image = shape.image
+    except (AttributeError, KeyError, ValueError):
+        image = None
+    if image is not None:
+        return image.blob
+
+    if rIds:
+        rel = shape.part.related_parts.get(rIds[0])
+        if rel is not None:
+            return rel.blob
     raise RuntimeError("No image found in shape")
 
+# O(1) membership tests for the drawing branches below; getattr-guarded
+# because some members only exist in newer python-pptx releases.
+def _shape_types(*names):
+    return frozenset(
+        t for t in (getattr(MSO_SHAPE_TYPE, n, None) for n in names)
+        if t is not None)
+
+_RECT_SHAPES = _shape_types("AUTO_SHAPE", "RECTANGLE", "ROUNDED_RECTANGLE")
+_ELLIPSE_SHAPES = _shape_types("ELLIPSE")
+_ARROW_SHAPES = _shape_types("ARROW", "CALLOUT")
+
+@lru_cache(maxsize=128)
+def _load_font(name, size):
+    """TTF parsing costs a disk read + FreeType init; cache per (name, size)."""
+    try:
+        return ImageFont.truetype(f"{name}.ttf", size)
+    except OSError:
+        return ImageFont.load_default()
+
 def draw_shape_as_image(shape):
     """Draw shape (rect, ellipse, arrow) with fill, border, and text."""
     scale = 2
     width = int(shape.width.pt * scale)
     height = int(shape.height.pt * scale)
 
-    img = Image.new("RGBA", (width, height), (255,255,255,0))
-    draw = ImageDraw.Draw(img)
-
     # Fill color
     fill_color = (255,255,255,0)
     try:
@@ -264,12 +543,23 @@ def draw_shape_as_image(shape):
         border_width = int(shape.line.width.pt*scale)
     except: pass
 
+    # Opaque fills (the common case) don't need an alpha channel: RGB is
+    # smaller to allocate and faster to PNG-encode. Unfilled shapes keep
+    # RGBA for the transparent background.
+    if fill_color[3] == 255:
+        img = Image.new("RGB", (width, height), "white")
+        fill_color = fill_color[:3]
+        border_color = border_color[:3]
+    else:
+        img = Image.new("RGBA", (width, height), (255,255,255,0))
+    draw = ImageDraw.Draw(img)
+
     stype = shape.shape_type
-    if stype in [MSO_SHAPE_TYPE.AUTO_SHAPE, MSO_SHAPE_TYPE.RECTANGLE, MSO_SHAPE_TYPE.ROUNDED_RECTANGLE]:
+    if stype in _RECT_SHAPES:
         draw.rectangle([(0,0),(width,height)], fill=fill_color, outline=border_color, width=border_width)
-    elif stype in [MSO_SHAPE_TYPE.ELLIPSE]:
+    elif stype in _ELLIPSE_SHAPES:
         draw.ellipse([(0,0),(width,height)], fill=fill_color, outline=border_color, width=border_width)
-    elif stype in [MSO_SHAPE_TYPE.ARROW, MSO_SHAPE_TYPE.CALLOUT]:
+    elif stype in _ARROW_SHAPES:
         draw.polygon([(0, height//2),(width-10,0),(width,height//2),(width-10,height)], fill=fill_color, outline=border_color)
 
     # Text inside shape
@@ -284,10 +574,9 @@ def draw_shape_as_image(shape):
                 text_color = (color[0],color[1],color[2],255) if color else (0,0,0,255)
             except:
                 font_name, font_size, text_color = "Arial", 14, (0,0,0,255)
-            try:
-                font = ImageFont.truetype(f"{font_name}.ttf", font_size)
-            except:
-                font = ImageFont.load_default()
+            font = _load_font(font_name, font_size)
+            if img.mode == "RGB":
+                text_color = text_color[:3]
             bbox = draw.textbbox((0,0), text, font=font)
             text_x = (width - (bbox[2]-bbox[0]))//2
             text_y = (height - (bbox[3]-bbox[1]))//2
@@ -299,271 +588,406 @@ def draw_shape_as_image(shape):
     return buf
 
 # -------------------------
-# Main endpoint
+# Slide extraction / document assembly
 # -------------------------
-@app.post("/convert/")
-async def convert(file: UploadFile = File(...), slide_separator: int = 0, use_line: int = 0):
+
+# Slide traversal is mostly lxml C-level XML walking, which releases the
+# GIL, so extraction parallelizes across slides. The Document itself is
+# only ever touched from the request thread (see _apply_ops).
+_SLIDE_POOL = ThreadPoolExecutor(max_workers=os.cpu_count() or 4)
+
+def _extract_table(shape, ops, media, debug):
     try:
-        original_filename = file.filename or "uploaded.pptx"
-        safe_name = safe_filename(os.path.splitext(original_filename)[0])
+        table = shape.table
+        rows = [[sanitize_text(c.text).strip() for c in row.cells]
+                for row in table.rows]
+        ops.append(("table", rows, len(table.columns)))
+    except: pass
 
-        logger.info(f"Received file: {original_filename.encode('utf-8', 'ignore').decode()}")
-        
-        content = await file.read()
-        pptx_path = f"/tmp/{uuid.uuid4()}.pptx"
-        with open(pptx_path,"wb") as f: f.write(content)
-        logger.info(f"Saved PPTX to {pptx_path}")
-
-        prs = Presentation(pptx_path)
-        doc = Document()
-
-        # Detect default font
-        default_font_name = "Utsaah"
-        for slide in prs.slides:
-            for shape in slide.shapes:
-                try:
-                    if shape.has_text_frame:
-                        for para in shape.text_frame.paragraphs:
-                            for run in para.runs:
-                                if run.font.name:
-                                    default_font_name = run.font.name
+def _extract_picture(shape, ops, media, debug):
+    try:
+        img_bytes = extract_image_from_shape(shape, media)
+        ops.append(("image", img_bytes,
+                    emu_to_inches(shape.width), emu_to_inches(shape.height)))
+    except Exception as e:
+        logger.warning(f"Image extraction failed: {e}")
+
+def _extract_chart(shape, ops, media, debug):
+    try:
+        if not hasattr(shape, "chart"):
+            return
+        chart_inserted = False
+        try:
+            chart_part = getattr(shape.chart, "chart_part", None)
+            if chart_part:
+                ops.append(("chart_image", chart_part.chart_space.blob))
+                chart_inserted = True
+        except: pass
+        if not chart_inserted:
+            try:
+                ops.append(("chart_image", render_chart_from_chart_data(shape.chart)))
+            except:
+                ops.append(("text", "[Chart could not be rendered]"))
+    except: pass
+
+def _extract_autoshape(shape, ops, media, debug):
+    try:
+        img_buf, w_in, h_in = render_shape_to_image(shape)
+        ops.append(("shape_image", img_buf, w_in, h_in))
+        if debug:
+            logger.debug("Rendered shape: %s", shape.shape_type)
+    except Exception as e:
+        logger.warning(f"Shape render failed: {e}")
+
+def _extract_default(shape, ops, media, debug):
+    # Shapes of other types (placeholders etc.) may still carry a picture.
+    try:
+        if hasattr(shape, "image") or _BLIP_XP(shape.element):
+            _extract_picture(shape, ops, media, debug)
+    except Exception as e:
+        logger.debug(f"Image block error: {e}")
+
+# One O(1) dispatch per shape instead of re-testing shape_type per
+# category. Built with getattr because some members (ARROW, CALLOUT,
+# RECTANGLE, ...) only exist in newer python-pptx releases.
+_EXTRACTORS = {}
+for _name, _fn in [("TABLE", _extract_table),
+                   ("PICTURE", _extract_picture),
+                   ("CHART", _extract_chart),
+                   ("AUTO_SHAPE", _extract_autoshape),
+                   ("ARROW", _extract_autoshape),
+                   ("CALLOUT", _extract_autoshape),
+                   ("ROUNDED_RECTANGLE", _extract_autoshape),
+                   ("RECTANGLE", _extract_autoshape)]:
+    _st = getattr(MSO_SHAPE_TYPE, _name, None)
+    if _st is not None:
+        _EXTRACTORS[_st] = _fn
+del _name, _fn, _st
+
+# Types whose text (if any) is handled by their own extractor -- no point
+# probing text frames on pictures, tables or charts.
+_NO_TEXT_TYPES = frozenset(
+    t for t in (getattr(MSO_SHAPE_TYPE, n, None) for n in ("TABLE", "PICTURE", "CHART"))
+    if t is not None)
+
+def walk_shapes(shapes):
+    """Yield leaf shapes in document order, flattening GROUP shapes.
+
+    Grouped text/pictures were previously dropped because the main loop
+    never looked inside GroupShape. Iterative stack, no Python recursion.
+    """
+    stack = list(shapes)
+    stack.reverse()
+    while stack:
+        sh = stack.pop()
+        if sh.shape_type == MSO_SHAPE_TYPE.GROUP:
+            stack.extend(reversed(list(sh.shapes)))
+        else:
+            yield sh
+
+def slide_to_ops(slide, media=None):
+    """Extract one slide into a list of document ops.
+
+    Each op is a tuple whose first element names the kind:
+    ("para", style, level, runs), ("text", str), ("table", rows, n_cols),
+    ("image", blob, w_in, h_in), ("chart_image", blob),
+    ("shape_image", buf, w_in, h_in). Safe to run in a worker thread --
+    it only reads the presentation tree and never touches the output doc.
+    """
+    debug = logger.isEnabledFor(logging.DEBUG)
+    ops = []
+    for sh_i, shape in enumerate(walk_shapes(slide.shapes), start=1):
+        st = shape.shape_type
+        if debug:
+            logger.debug("Shape %d type=%s", sh_i, st)
+
+        # Text (with robust bullets + sanitization)
+        try:
+            # Empty placeholder frames are common on template slides; one
+            # frame-level probe skips all their per-paragraph work.
+            if (st not in _NO_TEXT_TYPES and getattr(shape, "has_text_frame", False)
+                    and _NONEMPTY_T_XP(shape.text_frame._txBody)):
+                for para in shape.text_frame.paragraphs:
+                    if not _NONEMPTY_T_XP(para._p):
+                        continue
+
+                    # --- Detect bullet or numbering type safely ---
+                    # One pass over pPr's (few) children instead of three
+                    # find() walks per paragraph.
+                    list_style = None
+                    try:
+                        pPr = getattr(para._p, "pPr", None)
+                        if pPr is not None:
+                            for child in pPr:
+                                tag = etree.QName(child).localname
+                                if tag == "buChar":        # regular bullet (•, ○, –, →)
+                                    list_style = "List Bullet"
                                     break
-                            if default_font_name!="Utsaah": break
-                except: continue
-            if default_font_name!="Utsaah": break
-        logger.info(f"Default font detected: {default_font_name}")
-
-        # Process slides
-        for s_i, slide in enumerate(prs.slides, start=1):
-            logger.info(f"Processing slide {s_i}/{len(prs.slides)}")
-
-            for sh_i, shape in enumerate(slide.shapes, start=1):
-                logger.info(f"Shape {sh_i}/{len(slide.shapes)} type={shape.shape_type}")
-
-                # Text
-                # text = safe_get_text(shape).strip()
-                # if text and hasattr(shape, "text_frame") and shape.has_text_frame:
-                #     try:
-                #         for para in shape.text_frame.paragraphs:
-                #             if not para.text.strip(): continue
-                #             p = doc.add_paragraph()
-                #             for run in para.runs:
-                #                 r = p.add_run(run.text)
-                #                 try:
-                #                     r.font.name = default_font_name
-                #                     r.font.size = Pt(14)
-                #                     r.bold = run.font.bold
-                #                     r.italic = run.font.italic
-                #                     r.underline = run.font.underline
-                #                     rgb = pptx_color_to_rgb(run.font.color)
-                #                     if rgb: r.font.color.rgb = rgb
-                #                 except: pass
-                #     except:
-                #         doc.add_paragraph(text)
-
-                # 
-                # Text (with robust bullets + sanitization
+                                elif tag == "buAutoNum":   # numbered list (1., i., etc.)
+                                    list_style = "List Number"
+                                    break
+                                elif tag == "buNone":      # bullet explicitly off
+                                    break
+                    except Exception as e:
+                        logger.debug(f"Bullet detection failed: {e}")
+
+                    level = getattr(para, "level", 0)
+
+                    # No explicit runs (bullet placeholders, fields): keep
+                    # the text without the per-run formatting machinery.
+                    para_runs = para.runs
+                    if not para_runs:
+                        text = sanitize_text(para.text)
+                        if text.strip():
+                            ops.append(("para", list_style, level,
+                                        [(text, False, False, False, None)]))
+                        continue
+
+                    runs = []
+                    for run in para_runs:
+                        run_text = sanitize_text(run.text or "")
+                        if not run_text.strip():
+                            continue
+                        runs.append((
+                            run_text,
+                            bool(run.font.bold),
+                            bool(run.font.italic),
+                            bool(run.font.underline),
+                            pptx_color_to_rgb(run.font.color),
+                        ))
+                    ops.append(("para", list_style, level, runs))
+
+        except Exception as e:
+            logger.warning(f"Text extraction failed (fallback): {e}")
+            try:
+                fallback_text = sanitize_text(safe_get_text(shape))
+                if fallback_text:
+                    ops.append(("text", fallback_text))
+            except Exception as e2:
+                logger.error(f"Failed fallback text extraction: {e2}")
+
+        # Non-text content: tables, pictures, charts, rendered autoshapes
+        _EXTRACTORS.get(st, _extract_default)(shape, ops, media, debug)
+
+    return ops
+
+def _table_xml(rows, n_cols, font_name):
+    """Build a complete <w:tbl> XML string for one parse_xml call.
+
+    One lxml parse replaces rows x cols python-docx cell mutations; the
+    Table Grid style keeps the borders the old add_table path had.
+    """
+    fn = xml_escape(font_name, {'"': "&quot;"})
+    run_prefix = (f'<w:r><w:rPr><w:rFonts w:ascii="{fn}" w:hAnsi="{fn}"/>'
+                  f'<w:sz w:val="28"/></w:rPr><w:t xml:space="preserve">')
+    trs = []
+    for row in rows:
+        tcs = []
+        for txt in (list(row) + [""] * n_cols)[:n_cols]:
+            run = f"{run_prefix}{xml_escape(txt)}</w:t></w:r>" if txt else ""
+            tcs.append(f"<w:tc><w:p>{run}</w:p></w:tc>")
+        trs.append("<w:tr>" + "".join(tcs) + "</w:tr>")
+    return ('<w:tbl %s><w:tblPr><w:tblStyle w:val="TableGrid"/>'
+            '<w:tblW w:w="0" w:type="auto"/></w:tblPr>' % nsdecls("w")
+            + "<w:tblGrid>" + "<w:gridCol/>" * n_cols + "</w:tblGrid>"
+            + "".join(trs) + "</w:tbl>")
+
+def _add_picture_cached(doc, blob, width, height, cache):
+    """Insert an image, sharing the embedded part for repeated blobs.
+
+    Template decks repeat the same logo/background on every slide; without
+    this each occurrence would redo add_picture's header parsing and emit
+    another full <w:drawing> from scratch. Keyed on blake2b of the bytes.
+    """
+    # Chart renders arrive as a ready BytesIO; hash its buffer in place
+    # and feed it straight to add_picture instead of copying the bytes.
+    if isinstance(blob, BytesIO):
+        key = hashlib.blake2b(blob.getbuffer(), digest_size=16).digest()
+        stream = blob
+    else:
+        key = hashlib.blake2b(blob, digest_size=16).digest()
+        stream = None
+    hit = cache.get(key)
+    if hit is None:
+        doc.add_picture(stream if stream is not None else BytesIO(blob),
+                        width=width, height=height)
+        cache[key] = doc.inline_shapes[-1]._inline
+        return
+    inline = copy.deepcopy(hit)
+    docPr = inline.find(w_qn("wp:docPr"))
+    if docPr is not None:
+        # next_id scans the document for max(@id) + 1, so the copy stays
+        # unique against ids python-docx allocates itself.
+        docPr.set("id", str(doc.part.next_id))
+    drawing = OxmlElement("w:drawing")
+    drawing.append(inline)
+    run = doc.add_paragraph().add_run()
+    run._r.append(drawing)
+    shp = InlineShape(inline)
+    if width is not None:
+        shp.width = width
+    if height is not None:
+        shp.height = height
+
+def _apply_ops(doc, ops, default_font_name, image_cache=None):
+    """Apply a slide's extracted ops to the Word document (main thread only)."""
+    if image_cache is None:
+        image_cache = {}
+    for op in ops:
+        kind = op[0]
+        if kind == "para":
+            _, list_style, level, runs = op
+            if list_style:
+                p = doc.add_paragraph(style=list_style)
+            else:
+                p = doc.add_paragraph()
+
+            # --- Apply indentation level (PowerPoint nesting) ---
+            try:
+                if isinstance(level, int) and level > 0:
+                    # Each level adds 0.2" indentation
+                    p.paragraph_format.left_indent = Inches(0.2 * level)
+            except Exception as e:
+                logger.debug(f"Indentation failed: {e}")
+
+            for text, bold, italic, underline, rgb in runs:
                 try:
-                    if hasattr(shape, "text_frame") and shape.has_text_frame:
-                        for para in shape.text_frame.paragraphs:
-                            raw_para_text = para.text or ""
-                            if not raw_para_text.strip():
-                                continue
-                
-                            # --- Detect bullet or numbering type safely ---
-                            list_style = None
-                            try:
-                                pPr = getattr(para._p, "pPr", None)
-                                if pPr is not None:
-                                    # Regular bullet (•, ○, –, →)
-                                    buChar = pPr.find(qn("a:buChar"))
-                                    if buChar is not None:
-                                        list_style = "List Bullet"
-                
-                                    # Numbered list (1., i., etc.)
-                                    elif pPr.find(qn("a:buAutoNum")) is not None:
-                                        list_style = "List Number"
-                
-                                    # No bullet explicitly set
-                                    elif pPr.find(qn("a:buNone")) is not None:
-                                        list_style = None
-                            except Exception as e:
-                                logger.debug(f"Bullet detection failed: {e}")
-                
-                            # --- Choose Word paragraph style ---
-                            if list_style == "List Bullet":
-                                p = doc.add_paragraph(style="List Bullet")
-                            elif list_style == "List Number":
-                                p = doc.add_paragraph(style="List Number")
-                            else:
-                                p = doc.add_paragraph()
-                
-                            # --- Apply indentation level (PowerPoint nesting) ---
-                            try:
-                                level = getattr(para, "level", 0)
-                                if isinstance(level, int) and level > 0:
-                                    # Each level adds 0.5 cm indentation
-                                    p.paragraph_format.left_indent = Inches(0.2 * level)
-                            except Exception as e:
-                                logger.debug(f"Indentation failed: {e}")
-                
-                            # --- Add text runs (with styling + sanitization) ---
-                            for run in para.runs:
-                                run_text = run.text or ""
-                                run_text = sanitize_text(run_text)
-                                if not run_text.strip():
-                                    continue
-                
-                                try:
-                                    r = p.add_run(run_text)
-                                    # Preserve styling
-                                    try:
-                                        r.font.name = default_font_name
-                                        r.font.size = Pt(14)
-                                        r.bold = bool(run.font.bold)
-                                        r.italic = bool(run.font.italic)
-                                        r.underline = bool(run.font.underline)
-                                        rgb = pptx_color_to_rgb(run.font.color)
-                                        if rgb:
-                                            r.font.color.rgb = rgb
-                                    except Exception as style_err:
-                                        logger.debug(f"Run styling skipped: {style_err}")
-                
-                                except Exception as e:
-                                    # fallback if font fails
-                                    try:
-                                        p.add_run(sanitize_text(run_text))
-                                    except Exception as e2:
-                                        logger.error(f"Failed to add sanitized run: {e2}")
-                
+                    fast_add_run(p._p, text, default_font_name, 14,
+                                 bold, italic, underline, rgb)
                 except Exception as e:
-                    logger.warning(f"Text extraction failed (fallback): {e}")
+                    # fallback if direct XML run creation fails
+                    logger.debug(f"fast_add_run failed: {e}")
                     try:
-                        fallback_text = sanitize_text(safe_get_text(shape))
-                        if fallback_text:
-                            doc.add_paragraph(fallback_text)
+                        p.add_run(text)
                     except Exception as e2:
-                        logger.error(f"Failed fallback text insertion: {e2}")
+                        logger.error(f"Failed to add sanitized run: {e2}")
 
-                
+        elif kind == "text":
+            doc.add_paragraph(op[1])
 
+        elif kind == "table":
+            _, rows, n_cols = op
+            try:
+                doc.element.body.append(
+                    parse_xml(_table_xml(rows, n_cols, default_font_name)))
+            except Exception as e:
+                logger.warning(f"Table insert failed, table dropped: {e}")
 
-                # Table
-                try:
-                    if shape.shape_type == MSO_SHAPE_TYPE.TABLE:
-                        table = shape.table
-                        word_table = doc.add_table(rows=len(table.rows), cols=len(table.columns))
-                        word_table.style = "Table Grid"
-                        for r_idx, row in enumerate(table.rows):
-                            for c_idx, cell in enumerate(row.cells):
-                                txt = cell.text.strip()
-                                p = word_table.cell(r_idx, c_idx).paragraphs[0]
-                                run = p.runs[0] if p.runs else p.add_run(txt)
-                                run.font.size = Pt(14)
-                                run.font.name = default_font_name
-
-                except: pass
-
-                # # Image
-                # try:
-                #     if shape.shape_type == MSO_SHAPE_TYPE.PICTURE or hasattr(shape,"image") or "blip" in str(shape.element.xml):
-                #         try:
-                #             img_bytes = extract_image_from_shape(shape)
-                #             doc.add_picture(BytesIO(img_bytes), width=Inches(4))
-                #         except: pass
-                # except: pass
-                # Image
-                try:
-                    if shape.shape_type == MSO_SHAPE_TYPE.PICTURE or hasattr(shape, "image") or "blip" in str(shape.element.xml):
-                        try:
-                            img_bytes = extract_image_from_shape(shape)
-                            width_in = emu_to_inches(shape.width)
-                            height_in = emu_to_inches(shape.height)
-                            doc.add_picture(BytesIO(img_bytes), width=Inches(width_in), height=Inches(height_in))
-                            logger.info(f"Inserted image with original size: {width_in:.2f} x {height_in:.2f} inches")
-                        except Exception as e:
-                            logger.warning(f"Image extraction failed: {e}")
-                except Exception as e:
-                    logger.debug(f"Image block error: {e}")
+        elif kind == "image":
+            _, blob, w_in, h_in = op
+            try:
+                _add_picture_cached(doc, blob, Inches(w_in), Inches(h_in), image_cache)
+                logger.debug("Inserted image with original size: %.2f x %.2f inches", w_in, h_in)
+            except Exception as e:
+                logger.warning(f"Image insert failed: {e}")
 
-                # Chart
-                try:
-                    if hasattr(shape,"chart"):
-                        chart_inserted=False
-                        try:
-                            chart_part = getattr(shape.chart,"chart_part",None)
-                            if chart_part:
-                                img_stream = BytesIO(chart_part.chart_space.blob)
-                                doc.add_picture(img_stream, width=Inches(5))
-                                chart_inserted=True
-                        except: pass
-                        if not chart_inserted:
-                            try:
-                                img_bytes = render_chart_from_chart_data(shape.chart)
-                                doc.add_picture(BytesIO(img_bytes), width=Inches(5))
-                                chart_inserted=True
-                            except:
-                                doc.add_paragraph("[Chart could not be rendered]")
-                except: pass
-
-                # Shapes
-                try:
-                    if shape.shape_type in [MSO_SHAPE_TYPE.AUTO_SHAPE,
-                                            MSO_SHAPE_TYPE.ARROW, MSO_SHAPE_TYPE.CALLOUT,
-                                            MSO_SHAPE_TYPE.ROUNDED_RECTANGLE, MSO_SHAPE_TYPE.RECTANGLE]:
-                        img_path, w_in, h_in = render_shape_to_image(shape)
-                        doc.add_picture(img_path, width=Inches(w_in), height=Inches(h_in))
-                        logger.info(f"Rendered and inserted shape: {shape.shape_type}")
-                except Exception as e:
-                    logger.warning(f"Shape render failed: {e}")
-
-            # Handle use line logic
-
-            # 2️⃣ Apply separation only if not the last slide
-            if s_i < len(prs.slides):
-                if use_line == 1:
-                    # Draw horizontal divider line(s)
-                    p = doc.add_paragraph()
-                    p.alignment = 1  # Centered
-                    run = p.add_run("_" * 100)
-                    run.bold = True
-                    run.font.size = Pt(12)
-                    run.font.name = default_font_name
-
-
-
-            
-
-            # Slide separation: 2 blank lines
-            # -------------------------
-            # Handle slide separation logic
-            # -------------------------
-            if slide_separator == -1:
-                # New page for each slide
-                doc.add_page_break()
-            elif slide_separator == 0:
-                # No extra spacing between slides
-                pass
-            else:
-                # Add N blank lines between slides
-                for _ in range(slide_separator):
-                    doc.add_paragraph("")
+        elif kind == "chart_image":
+            try:
+                _add_picture_cached(doc, op[1], Inches(5), None, image_cache)
+            except Exception as e:
+                logger.warning(f"Chart insert failed: {e}")
+                doc.add_paragraph("[Chart could not be rendered]")
 
+        elif kind == "shape_image":
+            _, img_buf, w_in, h_in = op
+            try:
+                doc.add_picture(img_buf, width=Inches(w_in), height=Inches(h_in))
+            except Exception as e:
+                logger.warning(f"Shape insert failed: {e}")
+
+def _convert_sync(pptx_buf, slide_separator, use_line):
+    """CPU-heavy conversion body; runs in a worker thread via to_thread."""
+    prs = Presentation(pptx_buf)
+    media = load_media_map(pptx_buf)
+    doc = Document(BytesIO(_DOCX_TEMPLATE))
+
+    # Detect default font (stops at the first named run font)
+    default_font_name = _detect_default_font(prs)
+    logger.info(f"Default font detected: {default_font_name}")
+
+    # Process slides: extract in parallel, assemble serially
+    slide_ops = list(_SLIDE_POOL.map(partial(slide_to_ops, media=media), prs.slides))
+
+    image_cache = {}
+    n_slides = len(slide_ops)
+    for s_i, ops in enumerate(slide_ops, start=1):
+        logger.info("Applying slide %d/%d", s_i, n_slides)
+        _apply_ops(doc, ops, default_font_name, image_cache)
+
+        # 2⃣ Apply separation only if not the last slide
+        if s_i < n_slides:
+            if use_line == 1:
+                # Draw horizontal divider line(s)
+                p = doc.add_paragraph()
+                p.alignment = 1  # Centered
+                run = p.add_run("_" * 100)
+                run.bold = True
+                run.font.size = Pt(12)
+                run.font.name = default_font_name
+
+        # -------------------------
+        # Handle slide separation logic
+        # -------------------------
+        if slide_separator == -1:
+            # New page for each slide
+            doc.add_page_break()
+        elif slide_separator == 0:
+            # No extra spacing between slides
+            pass
+        else:
+            # N blank lines between slides, coalesced into one empty
+            # paragraph with equivalent spacing -- one XML node instead of
+            # N python-docx insertions.
+            p = doc.add_paragraph("")
+            if slide_separator > 1:
+                p.paragraph_format.space_after = Pt(14 * (slide_separator - 1))
+
+    # Save Word (in memory, no /tmp round trip)
+    add_page_border(doc)
+    out_buf = BytesIO()
+    doc.save(out_buf)
+    out_buf.seek(0)
+    logger.info(f"Saved Word document ({out_buf.getbuffer().nbytes} bytes)")
+    return out_buf.getvalue()
 
-        # Save Word
-        out_path = f"/tmp/{uuid.uuid4()}.docx"
-        add_page_border(doc)
-        doc.save(out_path)
-        logger.info(f"Saved Word to {out_path}")
 
-        def iterfile():
-            with open(out_path,"rb") as f: yield from f
+# -------------------------
+# Main endpoint
+# -------------------------
+@app.post("/convert/")
+async def convert(file: UploadFile = File(...), slide_separator: int = 0, use_line: int = 0):
+    try:
+        original_filename = file.filename or "uploaded.pptx"
+        safe_name = safe_filename(os.path.splitext(original_filename)[0])
+
+        logger.info(f"Received file: {original_filename.encode('utf-8', 'ignore').decode()}")
 
-        return StreamingResponse(
-            iterfile(),
+        # Stream the upload in bounded chunks; decks over the spool limit
+        # transparently spill to disk instead of growing resident memory.
+        pptx_buf = tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_MAX)
+        while chunk := await file.read(UPLOAD_CHUNK):
+            pptx_buf.write(chunk)
+        size = pptx_buf.tell()
+        pptx_buf.seek(0)
+        logger.info(f"Buffered PPTX upload ({size} bytes)")
+
+        # Everything below is CPU-bound (pptx parsing, docx building, chart
+        # rendering); run it off the event loop so concurrent requests are
+        # not serialized behind it.
+        docx_bytes = await asyncio.to_thread(
+            _convert_sync, pptx_buf, slide_separator, use_line)
+
+        # Single-shot Response: the document is already fully in memory, so
+        # one ASGI send beats pumping the buffer through StreamingResponse's
+        # per-chunk thread-pool hops.
+        return Response(
+            content=docx_bytes,
             media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
             headers={
-                "Content-Disposition": f'attachment; filename="{safe_name}.docx"; filename*=UTF-8\'\'{safe_name}.docx'
+                "Content-Disposition": f'attachment; filename="{safe_name}.docx"; filename*=UTF-8\'\'{safe_name}.docx',
+                # DOCX is already a ZIP; telling GZipMiddleware it is
+                # encoded keeps it from recompressing the stream.
+                "Content-Encoding": "identity",
             },
         )
     except Exception as e: